@@ -0,0 +1,27 @@
+"""
+Engine for the dice game Farkell. The game classes are imported on first use rather than with the package, so that
+short-lived processes (e.g. simulation workers started through game.cli) only pay for the modules they need.
+"""
+
+from importlib import import_module
+
+_exports = {
+    "Roll": ".game",
+    "Player": ".game",
+    "Game": ".game",
+    "GameMaker": ".game",
+    "InputType": ".game",
+    "Score": ".scoring",
+    "score_hand": ".scoring",
+    "name_hand": ".scoring",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
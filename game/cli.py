@@ -0,0 +1,210 @@
+"""
+Command line entry point for Farkell, run with `python -m game` or `python main.py`. Subcommands:
+
+    play      play an interactive game (the default, when no subcommand is given)
+    simulate  play many games between bots, optionally writing the results to a results store or spreading the
+              games over several worker processes
+    coordinate  hand out the games of a simulation to workers over a socket (only on localhost, unless --host is
+                given)
+    work      play the games handed out by a coordinator
+    advise    show the scoring options for a roll, with the odds of re-rolling the remaining dice
+    bench     time the scoring functions, outcome tables, dice streams and simulator
+
+Only argparse is imported up front; each subcommand imports the modules it needs when it runs, and the outcome tables
+are loaded from the on-disk cache (see game.tables), so that short-lived processes start quickly.
+"""
+
+import argparse
+import sys
+
+
+def play(args: argparse.Namespace) -> None:
+    from .game import GameMaker, InputType
+
+    if args.setup:
+        maker = GameMaker(InputType.COM)
+        sample_game = maker.new_game(args.setup)
+    else:
+        sample_game = GameMaker(InputType.USER).new_game()
+    sample_game.play()
+
+
+def print_summary(args: argparse.Namespace, wins: list[int], scores: list[int], turns: list[int]) -> None:
+    print(f"{args.games} games, master seed {args.seed}")
+    for seat, strategy in enumerate(args.strategies):
+        print(f"seat {seat} {strategy:<9} win rate {wins[seat] / args.games:.3f}, "
+              f"mean score {scores[seat] / args.games:.0f}, mean turns {turns[seat] / args.games:.1f}")
+
+
+def simulate(args: argparse.Namespace) -> None:
+    if args.workers > 1:
+        if args.out:
+            sys.exit("simulate: --out can't be used with --workers, as workers only send back totals.")
+        from .distributed import run_local
+        aggregate = run_local(args.workers, args.games, args.strategies, args.seed, args.batch_size,
+                              max_score=args.max_score, entry_score=args.entry_score)
+        print_summary(args, aggregate.wins, aggregate.scores, aggregate.turns)
+        return
+
+    from .simulate import simulate as simulate_games
+
+    rows = simulate_games(args.games, args.strategies, args.seed, max_score=args.max_score,
+                          entry_score=args.entry_score)
+
+    writer = None
+    if args.out:
+        from .results import ResultsWriter
+        writer = ResultsWriter(args.out)
+
+    wins, scores, turns = [0] * len(args.strategies), [0] * len(args.strategies), [0] * len(args.strategies)
+    for row in rows:
+        if writer:
+            writer.append(row)
+        wins[row.seat] += row.won
+        scores[row.seat] += row.score
+        turns[row.seat] += row.turns
+
+    if writer:
+        writer.close()
+
+    print_summary(args, wins, scores, turns)
+
+
+def coordinate(args: argparse.Namespace) -> None:
+    from .distributed import Coordinator
+
+    coordinator = Coordinator(args.games, args.strategies, args.seed, args.batch_size, args.host, args.port,
+                              max_score=args.max_score, entry_score=args.entry_score)
+    coordinator.start()
+    print("coordinating on {}:{}".format(*coordinator.address), flush=True)
+    aggregate = coordinator.wait()
+    print_summary(args, aggregate.wins, aggregate.scores, aggregate.turns)
+
+
+def work(args: argparse.Namespace) -> None:
+    from .distributed import run_worker
+
+    print(f"played {run_worker(args.host, args.port)} batches")
+
+
+def advise(args: argparse.Namespace) -> None:
+    from itertools import combinations
+
+    from .scoring import score_hand, name_hand
+    from .tables import load_tables
+
+    dice = args.dice
+    if not 1 <= len(dice) <= 6 or any(die not in range(1, 7) for die in dice):
+        sys.exit("advise: expected 1 to 6 dice, each between 1 and 6.")
+
+    possible_scores = score_hand(dice)
+    print(f"{name_hand(dice)}: {sum(score.value for score in possible_scores)}")
+    if not possible_scores:
+        return
+
+    tables = load_tables(args.cache_dir)
+    options = set()
+    for no_banked in range(len(possible_scores), 0, -1):
+        for banked in combinations(possible_scores, no_banked):
+            option = tuple((score.value, tuple(score.dice)) for score in banked)
+            if option in options:  # e.g. banking either of two single 5s
+                continue
+            options.add(option)
+            value = sum(score.value for score in banked)
+            remaining = len(dice) - sum(len(score.dice) for score in banked)
+            remaining = remaining or 6  # hot dice: all dice scored, so all six are rolled again
+            table = tables[remaining]
+            print(f"bank {value:>4} {[score.dice for score in banked]}, roll {remaining}: "
+                  f"farkle {table.farkle_probability():.1%}, expected roll score {table.expected_score():.0f}")
+
+
+def bench(args: argparse.Namespace) -> None:
+    from random import choices
+    from timeit import timeit
+
+    from .dice import DiceStream
+    from .scoring import score_hand
+    from .simulate import simulate as simulate_games
+    from .tables import load_tables, build_table, dice_from_counts
+
+    tables = load_tables(args.cache_dir)
+    hands = [dice_from_counts(outcome.counts) for table in tables.values() for outcome in table]
+
+    def report(name, seconds, operations):
+        print(f"{name:<24} {seconds / operations * 1e6:9.2f} us/op")
+
+    report("score_hand", timeit(lambda: [score_hand(hand) for hand in hands], number=args.repeat),
+           args.repeat * len(hands))
+    report("table lookup", timeit(lambda: [tables[len(hand)].index([hand.count(i) for i in range(1, 7)])
+                                           for hand in hands], number=args.repeat), args.repeat * len(hands))
+    stream = DiceStream(0)
+    report("random.choices roll", timeit(lambda: choices(range(1, 7), k=6), number=args.repeat * 10000),
+           args.repeat * 10000)
+    report("DiceStream roll", timeit(lambda: stream.roll(6), number=args.repeat * 10000), args.repeat * 10000)
+    report("build 6-dice table", timeit(lambda: build_table(6), number=1), 1)
+    report("simulate game", timeit(lambda: list(simulate_games(args.games, ["LAZY-BANK", "RANDOM"])), number=1),
+           args.games)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, not {value}.")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="farkell", description="A simple engine that plays the dice game, Farkell.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    play_parser = subparsers.add_parser("play", help="play an interactive game")
+    play_parser.add_argument("--setup", default="basic_setup.pkl",
+                             help="pickled game setup (default: %(default)s); pass '' to enter it at the terminal")
+    play_parser.set_defaults(func=play)
+
+    simulate_parser = subparsers.add_parser("simulate", help="play games between bots")
+    simulate_parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    simulate_parser.add_argument("--out", help="directory of a results store to append the results to")
+    simulate_parser.set_defaults(func=simulate)
+
+    coordinate_parser = subparsers.add_parser("coordinate", help="hand out games to workers")
+    coordinate_parser.add_argument("--host", default="127.0.0.1",
+                                   help="interface to listen on; e.g. 0.0.0.0 to accept workers on other machines")
+    coordinate_parser.add_argument("--port", type=int, default=5555)
+    coordinate_parser.set_defaults(func=coordinate)
+
+    for subparser in (simulate_parser, coordinate_parser):
+        subparser.add_argument("-n", "--games", type=positive_int, default=1000)
+        subparser.add_argument("--seed", type=int, default=0, help="master seed of the run")
+        subparser.add_argument("--strategies", nargs="+", default=["LAZY-BANK", "RANDOM"],
+                               choices=["RANDOM", "LAZY-BANK"], help="strategy of the bot in each seat")
+        subparser.add_argument("--max-score", type=int, default=10000)
+        subparser.add_argument("--entry-score", type=int, default=500)
+        subparser.add_argument("--batch-size", type=positive_int, default=100,
+                               help="games per batch handed to a worker")
+
+    work_parser = subparsers.add_parser("work", help="play games handed out by a coordinator")
+    work_parser.add_argument("--host", default="127.0.0.1")
+    work_parser.add_argument("--port", type=int, default=5555)
+    work_parser.set_defaults(func=work)
+
+    advise_parser = subparsers.add_parser("advise", help="show the options for a roll")
+    advise_parser.add_argument("dice", type=int, nargs="+")
+    advise_parser.set_defaults(func=advise)
+
+    bench_parser = subparsers.add_parser("bench", help="time the scoring and simulation")
+    bench_parser.add_argument("--repeat", type=positive_int, default=10)
+    bench_parser.add_argument("-n", "--games", type=positive_int, default=100)
+    bench_parser.set_defaults(func=bench)
+
+    for subparser in (advise_parser, bench_parser):
+        subparser.add_argument("--cache-dir", help="directory of the cached outcome tables")
+
+    return parser
+
+
+def main(argv: list[str] = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        args = build_parser().parse_args(["play"])
+    args.func(args)
@@ -0,0 +1,75 @@
+"""
+Sources of dice for rolls and simulations. A DiceStream pre-generates a large block of uniform dice values from a
+seedable generator in a couple of C-level calls, then hands out slices of it, so a roll costs a slice rather than a
+call to random.choices. A ReplayDice hands out a fixed sequence of dice instead, for tests and for replaying rolls.
+
+Both provide roll(no_dice), returning a list of dice, and flip(), returning a fair coin toss for the random decisions
+of a bot, which is taken from the parity of the next die so that it comes from the same stream.
+"""
+
+from random import Random
+
+"""Random bytes 0-251 map evenly onto the dice 1-6; 252-255 are rejected so that every die is equally likely."""
+_TO_DIE = bytes(i % 6 + 1 for i in range(256))
+_REJECTED = bytes(range(252, 256))
+
+
+class DiceStream:
+    """Dice drawn from a buffer of pre-generated values, refilled from a seeded random generator when it runs out."""
+    def __init__(self, seed: int | str = None, block_size: int = 65536):
+        if block_size < 1:
+            raise ValueError(f"block size must be positive, not {block_size}.")
+        self.rng = Random(seed)
+        self.block_size = block_size
+        self.buffer = b""
+        self.position = 0
+
+    def refill(self, no_dice: int) -> None:
+        """Top up the buffer so it holds at least the given number of unused dice, keeping any left over."""
+        buffer = self.buffer[self.position:]
+        while len(buffer) < no_dice:
+            buffer += self.rng.randbytes(self.block_size).translate(_TO_DIE, _REJECTED)
+        self.buffer, self.position = buffer, 0
+
+    def roll(self, no_dice: int) -> list[int]:
+        end = self.position + no_dice
+        if end > len(self.buffer):
+            self.refill(no_dice)
+            end = no_dice
+        dice = list(self.buffer[self.position:end])
+        self.position = end
+        return dice
+
+    def flip(self) -> bool:
+        return bool(self.roll(1)[0] & 1)
+
+
+class ReplayDice:
+    """Dice handed out in order from a fixed sequence, which raises a ValueError when it runs out."""
+    def __init__(self, dice: list[int]):
+        if any(die not in range(1, 7) for die in dice):
+            raise ValueError("replayed dice must be between 1 and 6.")
+        self.dice = list(dice)
+        self.position = 0
+
+    def roll(self, no_dice: int) -> list[int]:
+        end = self.position + no_dice
+        if end > len(self.dice):
+            raise ValueError(f"replay ran out of dice: {no_dice} needed but {len(self.dice) - self.position} left.")
+        dice = self.dice[self.position:end]
+        self.position = end
+        return dice
+
+    def flip(self) -> bool:
+        return bool(self.roll(1)[0] & 1)
+
+
+_default_stream = None
+
+
+def default_stream() -> DiceStream:
+    """The stream that computer-rolled dice come from, when no other source is given."""
+    global _default_stream
+    if _default_stream is None:
+        _default_stream = DiceStream()
+    return _default_stream
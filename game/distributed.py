@@ -0,0 +1,326 @@
+"""
+Coordinator and workers for simulating bot games over sockets, either as several processes on one machine or spread
+over several machines. The coordinator splits a run into batches of games, each with a seed derived from the run's
+master seed, and hands them to workers on request. A worker plays its batch with simulate.simulate_game and sends back
+the batch's Aggregate, which the coordinator merges into the result of the run.
+
+Workers never wait on each other: when there are no batches left to hand out, an idle worker steals a batch still
+held by another worker (the one with the fewest copies in play, then the oldest) and plays it too. Whichever copy of
+a batch finishes first is kept and later copies are dropped, so a slow or stalled worker can't hold up the run, and a
+worker that disconnects has its batches put back in the queue. Batches are pure functions of their seeds, so the
+merged result only depends on the master seed.
+
+Messages are single lines of JSON, so that nothing received from a worker is ever executed.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from time import monotonic, sleep
+import json
+import socket
+import socketserver
+import threading
+
+from .simulate import game_seed, simulate_game
+
+
+@dataclass
+class Aggregate:
+    """Totals over a set of games, per seat: how many games were won, and the total score, turns and farkles."""
+    games: int = 0
+    wins: list[int] = field(default_factory=list)
+    scores: list[int] = field(default_factory=list)
+    turns: list[int] = field(default_factory=list)
+    farkles: list[int] = field(default_factory=list)
+
+    @classmethod
+    def empty(cls, no_players: int):
+        return cls(0, [0] * no_players, [0] * no_players, [0] * no_players, [0] * no_players)
+
+    def add_game(self, rows) -> None:
+        self.games += 1
+        for row in rows:
+            self.wins[row.seat] += row.won
+            self.scores[row.seat] += row.score
+            self.turns[row.seat] += row.turns
+            self.farkles[row.seat] += row.farkles
+
+    def merge(self, other) -> None:
+        self.games += other.games
+        for totals, other_totals in ((self.wins, other.wins), (self.scores, other.scores),
+                                     (self.turns, other.turns), (self.farkles, other.farkles)):
+            for seat, total in enumerate(other_totals):
+                totals[seat] += total
+
+    @classmethod
+    def from_message(cls, message: dict, no_players: int):
+        """Rebuild an Aggregate sent by a worker, checking that it has the expected shape and is consistent."""
+        aggregate = cls(message["games"], message["wins"], message["scores"], message["turns"], message["farkles"])
+        columns = (aggregate.wins, aggregate.scores, aggregate.turns, aggregate.farkles)
+        if not isinstance(aggregate.games, int) or aggregate.games < 0 or any(
+                not isinstance(totals, list) or len(totals) != no_players
+                or not all(isinstance(total, int) and total >= 0 for total in totals)
+                for totals in columns):
+            raise ValueError("malformed aggregate.")
+        if sum(aggregate.wins) != aggregate.games:
+            raise ValueError(f"aggregate has {sum(aggregate.wins)} wins over {aggregate.games} games.")
+        return aggregate
+
+
+def send(file, message: dict) -> None:
+    file.write(json.dumps(message).encode() + b"\n")
+    file.flush()
+
+
+def receive(file) -> dict | None:
+    """Read a message, or return None if the other end has closed the connection."""
+    line = file.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def play_batch(games: list[list[int]], strategies: list[str], game_kwargs: dict) -> Aggregate:
+    """Play a batch of games, given as [game id, seed] pairs, and total up their results."""
+    aggregate = Aggregate.empty(len(strategies))
+    for game_id, seed in games:
+        aggregate.add_game(simulate_game(game_id, seed, strategies, **game_kwargs))
+    return aggregate
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves a single worker connection for a Coordinator."""
+    def handle(self) -> None:
+        coordinator = self.server.coordinator
+        worker = object()  # identifies this connection in the coordinator's leases
+        try:
+            while (message := receive(self.rfile)) is not None:
+                if not isinstance(message, dict):
+                    break
+                match message.get("op"):
+                    case "request":
+                        send(self.wfile, coordinator.assign(worker))
+                    case "result":
+                        coordinator.complete(worker, message["batch"], message["aggregate"])
+                    case _:
+                        break
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # a broken connection or bad message is treated the same as a worker disconnecting
+        finally:
+            coordinator.release(worker)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """
+    Hands out batches of games to workers and merges their results. Start it, point workers at its address, then
+    wait() for the result of the run.
+    """
+    def __init__(self,
+                 no_games: int,
+                 strategies: list[str],
+                 master_seed: int = 0,
+                 batch_size: int = 100,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 **game_kwargs):
+        if batch_size < 1:
+            raise ValueError(f"batch size must be positive, not {batch_size}.")
+        self.strategies = list(strategies)
+        self.game_kwargs = game_kwargs
+        self.batches = [list(range(first, min(first + batch_size, no_games)))
+                        for first in range(0, no_games, batch_size)]
+        self.master_seed = master_seed
+
+        self.pending = deque(range(len(self.batches)))
+        self.leases: dict[int: dict[object: float]] = {}  # batch: {worker: time the batch was handed to it}
+        self.results: dict[int: Aggregate] = {}
+        self.finished = threading.Condition()
+
+        self.server = _Server((host, port), _Handler, bind_and_activate=True)
+        self.server.coordinator = self
+        self.thread = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.server.server_address[:2]
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def done(self) -> bool:
+        return len(self.results) == len(self.batches)
+
+    def batch_message(self, batch: int) -> dict:
+        return {
+            "op": "batch",
+            "batch": batch,
+            "games": [[game_id, game_seed(self.master_seed, game_id)] for game_id in self.batches[batch]],
+            "strategies": self.strategies,
+            "game_kwargs": self.game_kwargs,
+        }
+
+    def assign(self, worker: object) -> dict:
+        """Choose what a worker asking for work should do next: play a batch, wait, or stop."""
+        with self.finished:
+            if self.done():
+                return {"op": "done"}
+
+            if self.pending:
+                batch = self.pending.popleft()
+            else:
+                # steal the batch with the fewest copies being played, breaking ties by the one held the longest,
+                # so that idle workers spread out over the batches that are still outstanding
+                stealable = [(len(holders), min(holders.values()), batch) for batch, holders in self.leases.items()
+                             if batch not in self.results and worker not in holders]
+                if not stealable:
+                    return {"op": "wait"}
+                batch = min(stealable)[2]
+
+            self.leases.setdefault(batch, {})[worker] = monotonic()
+            return self.batch_message(batch)
+
+    def complete(self, worker: object, batch: int, message: dict) -> None:
+        """Record the result of a batch from a worker, unless another worker got there first."""
+        if not isinstance(batch, int) or not 0 <= batch < len(self.batches):
+            raise ValueError(f"there is no batch {batch}.")
+        aggregate = Aggregate.from_message(message, len(self.strategies))
+        with self.finished:
+            if batch in self.results:  # a copy of a stolen batch, which was already finished by another worker
+                return
+            if worker not in self.leases.get(batch, {}):
+                raise ValueError(f"batch {batch} was not handed to this worker.")
+            if aggregate.games != len(self.batches[batch]):
+                raise ValueError(f"batch {batch} has {len(self.batches[batch])} games, not {aggregate.games}.")
+
+            self.results[batch] = aggregate
+            del self.leases[batch]
+            if self.done():
+                self.finished.notify_all()
+
+    def release(self, worker: object) -> None:
+        """Forget a worker that has disconnected, putting any batches only it held back in the queue."""
+        with self.finished:
+            for batch in list(self.leases):
+                holders = self.leases[batch]
+                holders.pop(worker, None)
+                if not holders:
+                    del self.leases[batch]
+                    if batch not in self.results:
+                        self.pending.appendleft(batch)
+
+    def wait_until_done(self, timeout: float = None) -> bool:
+        """Wait for every batch to finish, or for the timeout (in seconds) to pass; return whether the run is done."""
+        with self.finished:
+            return self.finished.wait_for(self.done, timeout)
+
+    def wait(self, timeout: float = None) -> Aggregate:
+        """
+        Wait for every batch to finish, then stop serving and merge the results in batch order. The coordinator stops
+        serving whether or not the run finished.
+
+        :param timeout: seconds to wait before giving up with a TimeoutError, or None to wait indefinitely.
+        :return: the totals over all the games in the run.
+        """
+        try:
+            if not self.wait_until_done(timeout):
+                raise TimeoutError(f"only {len(self.results)} of {len(self.batches)} batches finished.")
+        finally:
+            self.close()
+
+        aggregate = Aggregate.empty(len(self.strategies))
+        for batch in range(len(self.batches)):
+            aggregate.merge(self.results[batch])
+        return aggregate
+
+    def close(self) -> None:
+        if self.thread:
+            self.server.shutdown()
+            self.thread = None
+        self.server.server_close()
+
+
+def connect(host: str, port: int, timeout: float) -> socket.socket:
+    """Connect to a coordinator, retrying for a while in case it hasn't started listening yet."""
+    deadline = monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except ConnectionRefusedError:
+            if monotonic() >= deadline:
+                raise
+            sleep(0.1)
+
+
+def run_worker(host: str,
+               port: int,
+               poll_interval: float = 0.05,
+               max_batches: int = None,
+               connect_timeout: float = 10) -> int:
+    """
+    Play batches handed out by the coordinator at the given address until it says the run is done, or goes away. The
+    coordinator stops serving once the run is done, so losing the connection (e.g. while playing a stolen copy of a
+    batch that another worker finished) is treated as the end of the run.
+
+    :param host: the coordinator's host.
+    :param port: the coordinator's port.
+    :param poll_interval: seconds to wait before asking again when there is no work to hand out yet.
+    :param max_batches: stop after playing this many batches, or None to keep going until the run is done.
+    :param connect_timeout: seconds to keep retrying the connection for, if the coordinator isn't listening yet.
+    :return: the number of batches played.
+    """
+    played = 0
+    with connect(host, port, connect_timeout) as sock, sock.makefile("rwb") as file:
+        try:
+            while max_batches is None or played < max_batches:
+                send(file, {"op": "request"})
+                message = receive(file)
+                if message is None or message["op"] == "done":
+                    break
+                if message["op"] == "wait":
+                    sleep(poll_interval)
+                    continue
+
+                aggregate = play_batch(message["games"], message["strategies"], message["game_kwargs"])
+                send(file, {"op": "result", "batch": message["batch"], "aggregate": asdict(aggregate)})
+                played += 1
+        except (ConnectionResetError, BrokenPipeError, ConnectionAbortedError):
+            pass
+    return played
+
+
+def run_local(no_workers: int,
+              no_games: int,
+              strategies: list[str],
+              master_seed: int = 0,
+              batch_size: int = 100,
+              poll_interval: float = 0.5,
+              **game_kwargs) -> Aggregate:
+    """
+    Run a coordinator and the given number of worker processes on this machine, returning the merged result. If
+    every worker exits before the run is done, the coordinator is stopped and a RuntimeError raised.
+    """
+    from multiprocessing import Process
+
+    coordinator = Coordinator(no_games, strategies, master_seed, batch_size, **game_kwargs)
+    coordinator.start()
+    workers = [Process(target=run_worker, args=coordinator.address, daemon=True) for _ in range(no_workers)]
+    for worker in workers:
+        worker.start()
+    try:
+        while not coordinator.wait_until_done(poll_interval):
+            if not any(worker.is_alive() for worker in workers):
+                raise RuntimeError(f"every worker exited (exit codes {[worker.exitcode for worker in workers]}) "
+                                   f"with {len(coordinator.results)} of {len(coordinator.batches)} batches finished.")
+        return coordinator.wait()
+    finally:
+        coordinator.close()
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
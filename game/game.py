@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
-from random import choices, randint
+from random import randint
 from itertools import cycle
 
-from scoring import Score, score_hand, name_hand
-from errors import HandSizeError, DiceRangeError
+from .scoring import Score, score_hand, name_hand
+from .errors import HandSizeError, DiceRangeError
+from .dice import default_stream
 from setup.setup import InputType, AbstractGameFactory
 
 
@@ -11,16 +12,18 @@ from setup.setup import InputType, AbstractGameFactory
 class Roll:
     """
     Class for a roll on a given turn, to ensure that the roll is a legal combination of dice. Also provides
-    functionality for gathering the rolled dice, from user input or from the random module.
+    functionality for gathering the rolled dice, from user input or from a source of random dice.
     """
     input_type: InputType = InputType.COM
     no_dice: int = 6
     """N.B. the default 'roll' of dice should be an empty list which is then populated with the Roll.roll() method."""
     dice: list[int] = field(default_factory=list)
+    """Where computer-rolled dice come from, e.g. a seeded DiceStream or a ReplayDice; the default stream if None."""
+    source: object = None
 
     def roll(self, dice: list[int] = None) -> None:
         if self.input_type == InputType.COM:
-            self.dice = choices([1, 2, 3, 4, 5, 6], k=self.no_dice)
+            self.dice = (self.source or default_stream()).roll(self.no_dice)
         else:
             self.dice = dice
             self.check()
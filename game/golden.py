@@ -0,0 +1,128 @@
+"""
+Golden table of the score, score breakdown and name of every distinct roll of 1 to 6 dice, and verifiers that check a
+scoring implementation against it. The table is keyed by count vector (the number of 1s, 2s, ... 6s rolled), which
+covers all 6^k ordered rolls of k dice in 923 entries. A copy is frozen in testing/golden-scores.pkl, so that faster
+scoring engines (table lookups, batch scoring over arrays of count vectors, ...) can be checked against the rules as
+they stand today.
+"""
+
+from itertools import product
+from typing import NamedTuple, Callable, Iterable
+import pickle
+
+from .scoring import Score, score_hand, name_hand
+from .tables import MAX_DICE, dice_from_counts
+
+Breakdown = tuple[tuple[int, tuple[int, ...]], ...]
+
+
+class GoldenEntry(NamedTuple):
+    """The expected scoring of a roll: its total score, its breakdown (see normalise_breakdown) and its name."""
+    score: int
+    breakdown: Breakdown
+    name: str
+
+
+class Mismatch(NamedTuple):
+    """A roll that a scoring implementation got wrong, with what was expected and what was calculated."""
+    roll: tuple[int, ...]
+    expected: object
+    calculated: object
+
+
+def normalise_breakdown(scores: Iterable[Score]) -> Breakdown:
+    """Put a score breakdown into a canonical, hashable form: sorted (value, sorted dice) pairs."""
+    return tuple(sorted((value, tuple(sorted(dice))) for value, dice in scores))
+
+
+def count_vector(dice: Iterable[int]) -> tuple[int, ...]:
+    dice = list(dice)
+    return tuple(dice.count(i) for i in range(1, 7))
+
+
+def build_golden() -> dict[tuple[int, ...]: GoldenEntry]:
+    """Score, break down and name every distinct roll of 1 to 6 dice with the scoring module."""
+    golden = {}
+    for no_dice in range(1, MAX_DICE + 1):
+        for roll in product(range(1, 7), repeat=no_dice):
+            counts = count_vector(roll)
+            if counts in golden:
+                continue
+            dice = dice_from_counts(counts)
+            breakdown = score_hand(dice)
+            golden[counts] = GoldenEntry(sum(score.value for score in breakdown), normalise_breakdown(breakdown),
+                                         name_hand(dice))
+    return golden
+
+
+def save_golden(golden: dict[tuple[int, ...]: GoldenEntry], filepath) -> None:
+    # stored as plain tuples, so that the file doesn't depend on this module
+    with open(filepath, "wb") as file:
+        pickle.dump({counts: tuple(entry) for counts, entry in golden.items()}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_golden(filepath) -> dict[tuple[int, ...]: GoldenEntry]:
+    with open(filepath, "rb") as file:
+        return {counts: GoldenEntry(*entry) for counts, entry in pickle.load(file).items()}
+
+
+def rolls(golden: dict[tuple[int, ...]: GoldenEntry], exhaustive: bool = False):
+    """Yield (roll, golden entry) pairs: one sorted roll per entry, or every ordered roll if exhaustive."""
+    if not exhaustive:
+        for counts, entry in golden.items():
+            yield tuple(dice_from_counts(counts)), entry
+        return
+
+    for no_dice in range(1, MAX_DICE + 1):
+        for roll in product(range(1, 7), repeat=no_dice):
+            yield roll, golden[count_vector(roll)]
+
+
+def verify_scores(score_fn: Callable[[list[int]], int],
+                  golden: dict[tuple[int, ...]: GoldenEntry],
+                  exhaustive: bool = False) -> list[Mismatch]:
+    """
+    Check a scalar scoring function against the golden table.
+
+    :param score_fn: function taking a roll as a list of dice and returning its total score.
+    :param golden: the golden table to check against.
+    :param exhaustive: check every ordered roll rather than one roll per count vector, for implementations that
+                       might depend on the order of the dice.
+    :return: the rolls that were scored incorrectly; empty if the implementation is correct.
+    """
+    return [Mismatch(roll, entry.score, calculated) for roll, entry in rolls(golden, exhaustive)
+            if (calculated := score_fn(list(roll))) != entry.score]
+
+
+def verify_breakdowns(breakdown_fn: Callable[[list[int]], list[Score]],
+                      golden: dict[tuple[int, ...]: GoldenEntry],
+                      exhaustive: bool = False) -> list[Mismatch]:
+    """As verify_scores, for a function returning a score breakdown like score_hand. The order doesn't matter."""
+    return [Mismatch(roll, entry.breakdown, calculated) for roll, entry in rolls(golden, exhaustive)
+            if (calculated := normalise_breakdown(breakdown_fn(list(roll)))) != entry.breakdown]
+
+
+def verify_names(name_fn: Callable[[list[int]], str],
+                 golden: dict[tuple[int, ...]: GoldenEntry],
+                 exhaustive: bool = False) -> list[Mismatch]:
+    """As verify_scores, for a function naming a roll like name_hand."""
+    return [Mismatch(roll, entry.name, calculated) for roll, entry in rolls(golden, exhaustive)
+            if (calculated := name_fn(list(roll))) != entry.name]
+
+
+def verify_batch(batch_fn: Callable[[list[tuple[int, ...]]], Iterable[int]],
+                 golden: dict[tuple[int, ...]: GoldenEntry]) -> list[Mismatch]:
+    """
+    Check a batch scoring function, e.g. a table lookup or array-based scorer, against the golden table in one call.
+
+    :param batch_fn: function taking a list of count vectors (which converts directly to an n x 6 array) and
+                     returning their scores, in the same order.
+    :param golden: the golden table to check against.
+    :return: the count vectors that were scored incorrectly; empty if the implementation is correct.
+    """
+    count_vectors = list(golden)
+    calculated = [int(score) for score in batch_fn(count_vectors)]
+    if len(calculated) != len(count_vectors):
+        raise ValueError(f"batch scoring returned {len(calculated)} scores for {len(count_vectors)} rolls.")
+    return [Mismatch(counts, golden[counts].score, score) for counts, score in zip(count_vectors, calculated)
+            if score != golden[counts].score]
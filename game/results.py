@@ -0,0 +1,223 @@
+"""
+Columnar on-disk store for the results of simulated games of Farkell. Each row is the result of one player in one game,
+and each field of the row is written to its own raw binary file in the store's directory, so a single column can be
+memory-mapped and aggregated without reading the others (numpy.memmap or numpy.frombuffer can read the files
+directly, given the dtype and byte order from the manifest).
+
+Rows are buffered in memory and appended to the column files a chunk at a time. The manifest (manifest.json) is only
+rewritten after every column of a chunk is on disk, and readers ignore anything past the number of rows it records,
+so a store that is interrupted mid-write is still readable.
+"""
+
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+import json
+import mmap
+import os
+import sys
+
+MANIFEST = "manifest.json"
+STORE_FORMAT = 1
+
+
+class ResultRow(NamedTuple):
+    """The result of a single player in a single game."""
+    game_id: int
+    seed: int
+    seat: int
+    strategy: str
+    score: int
+    turns: int
+    farkles: int
+    won: bool
+
+
+class Column(NamedTuple):
+    """A column of the store: its name and the array typecode of the values stored in it."""
+    name: str
+    typecode: str
+
+
+"""N.B. strategies are stored as indices into the manifest's list of strategy names, and won as 0 or 1."""
+COLUMNS = (
+    Column("game_id", "Q"),
+    Column("seed", "Q"),
+    Column("seat", "B"),
+    Column("strategy", "H"),
+    Column("score", "i"),
+    Column("turns", "I"),
+    Column("farkles", "I"),
+    Column("won", "B"),
+)
+
+
+def column_path(path: Path, column: Column) -> Path:
+    return Path(path) / f"{column.name}.{column.typecode}.bin"
+
+
+def read_manifest(path: Path) -> dict:
+    with open(Path(path) / MANIFEST, "r") as file:
+        manifest = json.load(file)
+    if manifest["format"] != STORE_FORMAT:
+        raise ValueError(f"results store at {path} has format {manifest['format']}, expected {STORE_FORMAT}.")
+    if manifest["byteorder"] != sys.byteorder:
+        raise ValueError(f"results store at {path} was written {manifest['byteorder']}-endian.")
+    for column in COLUMNS:
+        if manifest["columns"].get(column.name) != [column.typecode, array(column.typecode).itemsize]:
+            raise ValueError(f"results store at {path} has an incompatible {column.name!r} column.")
+    return manifest
+
+
+class ResultsWriter:
+    """
+    Append ResultRows to a results store, creating it if it doesn't exist yet. Use as a context manager, or call
+    close() when done, so the final partial chunk is written.
+    """
+    def __init__(self, path: Path, chunk_size: int = 65536):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        if (self.path / MANIFEST).exists():
+            manifest = read_manifest(self.path)
+            self.rows, self.strategies = manifest["rows"], manifest["strategies"]
+            # drop any rows of a chunk that was only partially written
+            for column in COLUMNS:
+                with open(column_path(self.path, column), "ab") as file:
+                    file.truncate(self.rows * array(column.typecode).itemsize)
+        else:
+            self.rows, self.strategies = 0, []
+            for column in COLUMNS:
+                column_path(self.path, column).write_bytes(b"")
+            self.write_manifest()
+
+        self.strategy_ids = {name: i for i, name in enumerate(self.strategies)}
+        self.buffers = {column.name: array(column.typecode) for column in COLUMNS}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_manifest(self) -> None:
+        manifest = {
+            "format": STORE_FORMAT,
+            "byteorder": sys.byteorder,
+            "rows": self.rows,
+            "columns": {column.name: [column.typecode, array(column.typecode).itemsize] for column in COLUMNS},
+            "strategies": self.strategies,
+        }
+        tmp_path = self.path / (MANIFEST + ".tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(manifest, file, indent=1)
+        os.replace(tmp_path, self.path / MANIFEST)
+
+    def strategy_id(self, strategy: str) -> int:
+        if strategy not in self.strategy_ids:
+            self.strategy_ids[strategy] = len(self.strategies)
+            self.strategies.append(strategy)
+        return self.strategy_ids[strategy]
+
+    def append(self, row: ResultRow) -> None:
+        buffers = self.buffers
+        buffers["game_id"].append(row.game_id)
+        buffers["seed"].append(row.seed)
+        buffers["seat"].append(row.seat)
+        buffers["strategy"].append(self.strategy_id(row.strategy))
+        buffers["score"].append(row.score)
+        buffers["turns"].append(row.turns)
+        buffers["farkles"].append(row.farkles)
+        buffers["won"].append(int(row.won))
+
+        if len(buffers["game_id"]) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, rows) -> None:
+        for row in rows:
+            self.append(row)
+
+    def flush(self) -> None:
+        """Write the buffered chunk to the column files, then record it in the manifest."""
+        buffered = len(self.buffers["game_id"])
+        if not buffered:
+            return
+
+        for column in COLUMNS:
+            with open(column_path(self.path, column), "ab") as file:
+                self.buffers[column.name].tofile(file)
+            self.buffers[column.name] = array(column.typecode)
+
+        self.rows += buffered
+        self.write_manifest()
+
+    def close(self) -> None:
+        self.flush()
+
+
+class ResultsReader:
+    """
+    Read-only view of a results store. Columns are memory-mapped on first access and returned as memoryviews, which
+    support len(), indexing, iteration and the buffer protocol. Use as a context manager, or call close() when done.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        manifest = read_manifest(self.path)
+        self.rows = manifest["rows"]
+        self.strategies = manifest["strategies"]
+        self.columns = {column.name: column for column in COLUMNS}
+        self._maps = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> memoryview:
+        """
+        Memory-map a single column of the store.
+
+        :param name: the name of the column, one of the fields of ResultRow.
+        :return: memoryview of the column's values, with one element per row.
+        """
+        try:
+            column = self.columns[name]
+        except KeyError:
+            raise KeyError(f"no column {name!r}; columns are {', '.join(self.columns)}.") from None
+
+        nbytes = self.rows * array(column.typecode).itemsize
+        if not nbytes:  # mmap can't map an empty file
+            return memoryview(array(column.typecode))
+
+        if name not in self._maps:
+            with open(column_path(self.path, column), "rb") as file:
+                self._maps[name] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._maps[name]) < nbytes:
+                raise ValueError(f"column {name!r} is shorter than the {self.rows} rows in the manifest.")
+        return memoryview(self._maps[name])[:nbytes].cast(column.typecode)
+
+    def total(self, name: str) -> int:
+        return sum(self.column(name))
+
+    def mean(self, name: str) -> float:
+        return self.total(name) / self.rows if self.rows else 0.0
+
+    def row(self, i: int) -> ResultRow:
+        """Reassemble a single row of the store, mainly for debugging."""
+        values = {name: self.column(name)[i] for name in self.columns}
+        values["strategy"] = self.strategies[values["strategy"]]
+        values["won"] = bool(values["won"])
+        return ResultRow(**values)
+
+    def close(self) -> None:
+        for mapped in self._maps.values():
+            try:
+                mapped.close()
+            except BufferError:
+                pass  # a column is still in use; the map is closed when the last view of it is released
+        self._maps.clear()
@@ -0,0 +1,123 @@
+"""
+Headless simulation of games of Farkell between computer-controlled players. The bots follow the same strategies as a
+COM Player in game.py, but play without any terminal output and draw their dice (and random decisions) from a
+DiceStream seeded per game, so any game can be replayed from its seed. Results are returned as ResultRows, ready for
+a ResultsWriter.
+"""
+
+from random import Random
+
+from .dice import DiceStream
+from .results import ResultRow
+from .scoring import score_hand
+
+STRATEGIES = ("RANDOM", "LAZY-BANK")
+"""A game uses a few thousand dice at most, so there's no point generating more than this at a time."""
+GAME_BLOCK_SIZE = 4096
+
+
+def game_seed(master_seed: int, game_id: int) -> int:
+    """Derive the seed of a single game from the master seed of a run, independent of the order games are played."""
+    return Random(f"{master_seed}:{game_id}").getrandbits(64)
+
+
+def play_turn(strategy: str, dice) -> tuple[int, bool]:
+    """
+    Play a single turn for a bot, following the same rules as Player.turn.
+
+    :param strategy: the bot's strategy, one of STRATEGIES.
+    :param dice: the source of dice (see game.dice) to roll and make random decisions with.
+    :return: tuple of the score for the turn, and whether the bot farkled. A bot that sets aside no dice and then
+             stops also scores 0, without having farkled.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"{strategy} is not a valid strategy.")
+
+    available_dice, bank = 6, 0
+    while True:
+        possible_scores = score_hand(dice.roll(available_dice))
+
+        if not possible_scores:  # if the player doesn't score, the turn ends and no score is added
+            return 0, True
+        elif len(possible_scores) == 1 or strategy == "LAZY-BANK":
+            decisions = [True] * len(possible_scores)
+        else:
+            decisions = [dice.flip() for _ in possible_scores]
+
+        dice_to_remove = 0
+        for possible_score, decision in zip(possible_scores, decisions):
+            if decision:
+                bank += possible_score.value
+                dice_to_remove += len(possible_score.dice)
+
+        if dice_to_remove == available_dice:
+            available_dice = 6
+        else:
+            available_dice -= dice_to_remove
+
+        if strategy == "LAZY-BANK" or not dice.flip():
+            return bank, False
+
+
+def simulate_game(game_id: int,
+                  seed: int,
+                  strategies: list[str],
+                  max_score: int = 10000,
+                  entry_score: int = 500,
+                  max_rounds: int = 1000,
+                  dice=None) -> list[ResultRow]:
+    """
+    Play a game between bots, one per strategy given, in seat order. As in Game.play, a player's turn only counts
+    once it beats the entry score, and once a player reaches the max score every other player has one last turn.
+
+    :param game_id: identifier of the game, recorded in the results.
+    :param seed: seed for the game's stream of dice.
+    :param strategies: the strategy of the bot in each seat.
+    :param max_score: score that triggers the last round.
+    :param entry_score: score that a turn has to beat for a player to get into the game.
+    :param max_rounds: safety limit on the length of the game, after which it ends as if the last round was over.
+    :param dice: the source of dice for the game, e.g. a ReplayDice; a DiceStream seeded with the seed if None.
+    :return: the result of each player, in seat order.
+    """
+    if dice is None:
+        dice = DiceStream(seed, GAME_BLOCK_SIZE)
+    no_players = len(strategies)
+    scores, turns, farkles = [0] * no_players, [0] * no_players, [0] * no_players
+    in_the_game = [False] * no_players
+    final_seat = None
+
+    for turn in range(max_rounds * no_players):
+        seat = turn % no_players
+        if seat == final_seat:
+            break
+
+        turn_score, farkled = play_turn(strategies[seat], dice)
+        turns[seat] += 1
+        if farkled:
+            farkles[seat] += 1
+        elif in_the_game[seat]:
+            scores[seat] += turn_score
+        elif turn_score > entry_score:
+            in_the_game[seat] = True
+            scores[seat] += turn_score
+
+        if final_seat is None and scores[seat] >= max_score:
+            final_seat = seat
+
+    winner = max(range(no_players), key=lambda i: scores[i])
+    return [ResultRow(game_id, seed, seat, strategy, scores[seat], turns[seat], farkles[seat], seat == winner)
+            for seat, strategy in enumerate(strategies)]
+
+
+def simulate(no_games: int, strategies: list[str], master_seed: int = 0, first_game: int = 0, **game_kwargs):
+    """
+    Simulate a run of games, yielding the results of each player in each game.
+
+    :param no_games: the number of games to play.
+    :param strategies: the strategy of the bot in each seat.
+    :param master_seed: seed from which every game's seed is derived.
+    :param first_game: id of the first game, so that a run can be split into several batches.
+    :param game_kwargs: further arguments for simulate_game.
+    """
+    for game_id in range(first_game, first_game + no_games):
+        yield from simulate_game(game_id, game_seed(master_seed, game_id), strategies, **game_kwargs)
@@ -0,0 +1,197 @@
+"""
+Exact probability tables for the outcomes of rolling between 1 and 6 dice in Farkell. Every one of the 6^k ordered
+rolls of k dice is enumerated once and collapsed onto its count vector (the number of 1s, 2s, ... 6s rolled), which is
+weighted by the number of ordered rolls that produce it. Each distinct outcome is scored with score_hand and named with
+name_hand, and the results are stored as compact arrays in an OutcomeTable.
+
+Building the tables takes a noticeable fraction of a second, so their arrays are pickled to a cache directory and
+reused. The cache is versioned against the source of the scoring module, so any change to the scoring rules
+invalidates it.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from hashlib import sha256
+from itertools import product
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple
+import os
+import pickle
+
+from . import scoring
+from .scoring import score_hand, name_hand
+
+MAX_DICE = 6
+CACHE_ENV_VAR = "FARKELL_CACHE_DIR"
+"""Bumped whenever the layout of an OutcomeTable changes, independently of the scoring rules."""
+TABLE_FORMAT = 1
+
+
+class Outcome(NamedTuple):
+    """A single distinct outcome of a roll: the count of each die value, how many ordered rolls give it, its score
+    and its name."""
+    counts: tuple[int, ...]
+    weight: int
+    score: int
+    name: str
+
+
+@dataclass(frozen=True)
+class OutcomeTable:
+    """
+    All distinct outcomes of rolling a given number of dice, stored column-wise. Outcome i has die value v appearing
+    counts[6 * i + v - 1] times, occurs in weights[i] of the 6^no_dice ordered rolls, scores scores[i] and is named
+    names[name_ids[i]].
+    """
+    no_dice: int
+    counts: array
+    weights: array
+    scores: array
+    name_ids: array
+    names: tuple[str, ...]
+    _index: dict[tuple[int, ...]: int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_index", {self.count_vector(i): i for i in range(len(self))})
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    @property
+    def total_weight(self) -> int:
+        """The number of ordered rolls of the dice, i.e. 6^no_dice."""
+        return 6 ** self.no_dice
+
+    def count_vector(self, i: int) -> tuple[int, ...]:
+        return tuple(self.counts[6 * i: 6 * i + 6])
+
+    def probability(self, i: int) -> float:
+        return self.weights[i] / self.total_weight
+
+    def outcome(self, i: int) -> Outcome:
+        return Outcome(self.count_vector(i), self.weights[i], self.scores[i], self.names[self.name_ids[i]])
+
+    def __iter__(self):
+        return (self.outcome(i) for i in range(len(self)))
+
+    def index(self, counts: tuple[int, ...]) -> int:
+        """
+        Find the outcome with the given count vector.
+
+        :param counts: the number of occurrences of each die value, 1 to 6.
+        :return: the index of the outcome in the table.
+        """
+        try:
+            return self._index[tuple(counts)]
+        except KeyError:
+            raise ValueError(f"{tuple(counts)} is not an outcome of rolling {self.no_dice} dice.") from None
+
+    def farkle_probability(self) -> float:
+        """The probability that a roll of these dice doesn't score."""
+        return sum(w for w, s in zip(self.weights, self.scores) if s == 0) / self.total_weight
+
+    def expected_score(self) -> float:
+        """The mean score of a roll of these dice, if every scoring die is banked."""
+        return sum(w * s for w, s in zip(self.weights, self.scores)) / self.total_weight
+
+
+def dice_from_counts(counts: tuple[int, ...]) -> list[int]:
+    """Expand a count vector into the (sorted) list of dice that it describes."""
+    return [die for die, n in enumerate(counts, start=1) for _ in range(n)]
+
+
+def build_table(no_dice: int) -> OutcomeTable:
+    """
+    Enumerate every ordered roll of the given number of dice and collapse them into an OutcomeTable.
+
+    :param no_dice: the number of dice rolled, between 1 and 6.
+    :return: the table of distinct outcomes, in descending order of count vector (so six 1s comes first).
+    """
+    if not 1 <= no_dice <= MAX_DICE:
+        raise ValueError(f"can only tabulate rolls of 1 to {MAX_DICE} dice, not {no_dice}.")
+
+    weights = {}
+    for roll in product(range(1, 7), repeat=no_dice):
+        counts = tuple(roll.count(i) for i in range(1, 7))
+        weights[counts] = weights.get(counts, 0) + 1
+
+    table_counts, table_weights, table_scores, name_ids = array("B"), array("I"), array("H"), array("B")
+    names = {}
+    for counts in sorted(weights, reverse=True):
+        dice = dice_from_counts(counts)
+        name = name_hand(dice)
+        table_counts.extend(counts)
+        table_weights.append(weights[counts])
+        table_scores.append(sum(score.value for score in score_hand(dice)))
+        name_ids.append(names.setdefault(name, len(names)))
+
+    return OutcomeTable(no_dice, table_counts, table_weights, table_scores, name_ids, tuple(names))
+
+
+def scoring_version() -> str:
+    """Fingerprint of the scoring rules (and the table layout) that the tables were built with."""
+    digest = sha256(Path(scoring.__file__).read_bytes())
+    digest.update(str(TABLE_FORMAT).encode())
+    return digest.hexdigest()[:16]
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_ENV_VAR, Path.home() / ".cache" / "farkell"))
+
+
+def cache_path(cache_dir: Path = None) -> Path:
+    cache_dir = default_cache_dir() if cache_dir is None else Path(cache_dir)
+    return cache_dir / f"outcome-tables-{scoring_version()}.pkl"
+
+
+"""Tables already loaded by this process, keyed by the (resolved) path of the cache file they came from."""
+_tables: dict[Path: MappingProxyType] = {}
+
+
+def load_tables(cache_dir: Path = None, rebuild: bool = False) -> MappingProxyType:
+    """
+    Get the outcome tables for 1 to 6 dice, from memory, the on-disk cache or by building them (in that order of
+    preference). Freshly built tables are written to the cache; failing to write the cache is not an error.
+
+    :param cache_dir: directory holding the pickled tables, defaults to $FARKELL_CACHE_DIR or ~/.cache/farkell.
+    :param rebuild: ignore any cached tables and enumerate the rolls again.
+    :return: read-only mapping of the number of dice to its OutcomeTable.
+    """
+    path = cache_path(cache_dir).resolve()
+    if path in _tables and not rebuild:
+        return _tables[path]
+
+    tables = None
+    if not rebuild:
+        try:
+            with open(path, "rb") as file:
+                columns = pickle.load(file)
+            if isinstance(columns, dict) and set(columns) == set(range(1, MAX_DICE + 1)):
+                tables = {no_dice: OutcomeTable(no_dice, *columns[no_dice]) for no_dice in columns}
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError, ValueError):
+            tables = None
+
+    if tables is None:
+        tables = {no_dice: build_table(no_dice) for no_dice in range(1, MAX_DICE + 1)}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as file:
+                # only builtin types are pickled, so the cache doesn't depend on where this module is imported from
+                columns = {no_dice: (table.counts, table.weights, table.scores, table.name_ids, table.names)
+                           for no_dice, table in tables.items()}
+                pickle.dump(columns, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    _tables[path] = MappingProxyType(tables)
+    return _tables[path]
+
+
+def get_table(no_dice: int) -> OutcomeTable:
+    """Get the OutcomeTable for rolling the given number of dice."""
+    if not 1 <= no_dice <= MAX_DICE:
+        raise ValueError(f"can only tabulate rolls of 1 to {MAX_DICE} dice, not {no_dice}.")
+    return load_tables()[no_dice]
@@ -1,6 +1,5 @@
-import game
+from game.cli import main
 
 
 if __name__ == "__main__":
-    sample_game = game.GameMaker(game.InputType.COM).new_game("basic_setup.pkl")
-    sample_game.play()
+    main()
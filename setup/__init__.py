@@ -0,0 +1 @@
+from .setup import InputType, AbstractGameFactory
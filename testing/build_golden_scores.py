@@ -0,0 +1,3 @@
+from game.golden import build_golden, save_golden
+
+save_golden(build_golden(), "golden-scores.pkl")
@@ -0,0 +1,46 @@
+import pytest
+
+from game import InputType, Roll
+from game.dice import DiceStream, ReplayDice
+from game.simulate import play_turn
+
+
+def test_stream_is_seeded_and_uniform():
+    assert DiceStream(42).roll(100) == DiceStream(42).roll(100)
+
+    dice = DiceStream(1, block_size=1000).roll(60000)  # several refills, with leftovers carried over
+    assert len(dice) == 60000
+    for die in range(1, 7):
+        assert 9500 < dice.count(die) < 10500
+
+
+def test_stream_slices_match_single_draw():
+    stream = DiceStream(7, block_size=64)
+    rolls = [die for no_dice in [6, 5, 3, 6, 1, 2] * 20 for die in stream.roll(no_dice)]
+    assert rolls == DiceStream(7, block_size=64).roll(len(rolls))
+
+
+def test_block_size_must_be_positive():
+    with pytest.raises(ValueError):
+        DiceStream(0, block_size=0)
+
+
+def test_replay():
+    replay = ReplayDice([1, 1, 1, 2, 3, 4, 5, 2])
+    assert replay.roll(6) == [1, 1, 1, 2, 3, 4]
+    assert replay.flip() is True
+    with pytest.raises(ValueError):
+        replay.roll(2)
+
+
+def test_roll_from_source():
+    roll = Roll(InputType.COM, 6, source=ReplayDice([1, 1, 1, 2, 3, 4]))
+    roll.roll()
+    assert roll.score_total() == 300
+
+
+def test_bot_turn_replay():
+    # the lazy bot banks the three of a kind and the five, then ends its turn
+    assert play_turn("LAZY-BANK", ReplayDice([2, 2, 2, 5, 3, 4])) == (250, False)
+    # the random bot banks both ones (odd flips), rolls on (odd flip), then farkles
+    assert play_turn("RANDOM", ReplayDice([1, 1, 2, 3, 4, 6, 1, 1, 1, 2, 2, 3, 4])) == (0, True)
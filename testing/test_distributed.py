@@ -0,0 +1,153 @@
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from game.distributed import Aggregate, Coordinator, run_local, run_worker, send, receive
+from game.simulate import simulate
+
+strategies = ["LAZY-BANK", "RANDOM"]
+game_kwargs = {"max_score": 2000}
+
+
+def expected_aggregate(no_games, master_seed):
+    aggregate = Aggregate.empty(len(strategies))
+    rows = list(simulate(no_games, strategies, master_seed, **game_kwargs))
+    for i in range(0, len(rows), len(strategies)):
+        aggregate.add_game(rows[i:i + len(strategies)])
+    return aggregate
+
+
+def start_workers(coordinator, no_workers):
+    threads = [threading.Thread(target=run_worker, args=coordinator.address, daemon=True) for _ in range(no_workers)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_local_processes_match_single_process():
+    assert run_local(2, 60, strategies, 11, batch_size=7, **game_kwargs) == expected_aggregate(60, 11)
+
+
+def test_dropped_and_stalled_workers():
+    coordinator = Coordinator(40, strategies, 5, batch_size=5, **game_kwargs)
+    coordinator.start()
+
+    # one worker takes a batch and hangs up, another takes a batch and never finishes it
+    with socket.create_connection(coordinator.address) as sock, sock.makefile("rwb") as file:
+        send(file, {"op": "request"})
+        assert receive(file)["op"] == "batch"
+    stalled = socket.create_connection(coordinator.address)
+    stalled_file = stalled.makefile("rwb")
+    send(stalled_file, {"op": "request"})
+    assert receive(stalled_file)["op"] == "batch"
+
+    start_workers(coordinator, 2)
+    try:
+        assert coordinator.wait(timeout=30) == expected_aggregate(40, 5)
+    finally:
+        stalled_file.close()
+        stalled.close()
+
+
+@pytest.mark.parametrize("bogus", [
+    {"games": 1, "wins": [1, 0], "scores": [0, 0], "turns": [0, 0], "farkles": [0, 0]},
+    {"games": 5, "wins": [6, -1], "scores": [0, 0], "turns": [0, 0], "farkles": [0, 0]},
+    {"games": 5, "wins": [5, 0], "scores": [-100, 0], "turns": [0, 0], "farkles": [0, 0]},
+    {"games": 5, "wins": [4, 0], "scores": [0, 0], "turns": [0, 0], "farkles": [0, 0]},
+])
+def test_bad_results_are_rejected(bogus):
+    coordinator = Coordinator(10, strategies, 5, batch_size=5, **game_kwargs)
+    coordinator.start()
+
+    with socket.create_connection(coordinator.address) as sock, sock.makefile("rwb") as file:
+        send(file, {"op": "request"})
+        batch = receive(file)["batch"]
+        send(file, {"op": "result", "batch": batch, "aggregate": bogus})
+        assert receive(file) is None  # the coordinator hangs up on a worker sending bad results
+
+    start_workers(coordinator, 1)
+    assert coordinator.wait(timeout=30) == expected_aggregate(10, 5)
+
+
+def test_non_object_message_drops_worker():
+    coordinator = Coordinator(10, strategies, 5, batch_size=5, **game_kwargs)
+    coordinator.start()
+
+    with socket.create_connection(coordinator.address) as sock, sock.makefile("rwb") as file:
+        send(file, [1])
+        assert receive(file) is None
+
+    start_workers(coordinator, 1)
+    assert coordinator.wait(timeout=30) == expected_aggregate(10, 5)
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        Coordinator(10, strategies, batch_size=0)
+
+
+def test_idle_workers_steal_different_batches():
+    coordinator = Coordinator(15, strategies, 5, batch_size=5, **game_kwargs)
+    try:
+        holders = [object() for _ in range(3)]
+        assert [coordinator.assign(holder)["batch"] for holder in holders] == [0, 1, 2]
+
+        thieves = [object() for _ in range(2)]
+        stolen = [coordinator.assign(thief)["batch"] for thief in thieves]
+        assert stolen == [0, 1]
+        assert {batch: len(leases) for batch, leases in coordinator.leases.items()} == {0: 2, 1: 2, 2: 1}
+    finally:
+        coordinator.close()
+
+
+def test_wait_timeout_stops_serving():
+    coordinator = Coordinator(10, strategies, 5, batch_size=5, **game_kwargs)
+    coordinator.start()
+    address = coordinator.address
+
+    with pytest.raises(TimeoutError):
+        coordinator.wait(timeout=0.1)
+    with pytest.raises(ConnectionRefusedError):
+        socket.create_connection(address).close()
+
+
+def test_worker_started_before_coordinator():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    played = []
+    worker = threading.Thread(target=lambda: played.append(run_worker("127.0.0.1", port)), daemon=True)
+    worker.start()
+    time.sleep(0.3)
+
+    coordinator = Coordinator(10, strategies, 5, batch_size=5, port=port, **game_kwargs)
+    coordinator.start()
+    assert coordinator.wait(timeout=30) == expected_aggregate(10, 5)
+    worker.join(timeout=5)
+    assert played == [2]
+
+
+def test_worker_survives_reset_connection():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+
+        def reset():
+            connection, _ = server.accept()
+            connection.recv(1024)
+            # close with a RST rather than a FIN, as if the coordinator had gone away
+            connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            connection.close()
+
+        threading.Thread(target=reset, daemon=True).start()
+        assert run_worker(*server.getsockname()) == 0
+
+
+def test_run_local_fails_when_workers_die():
+    # every worker raises on the unknown strategy, so no batch can ever finish
+    with pytest.raises(RuntimeError, match="every worker exited"):
+        run_local(2, 10, ["LAZY-BANK", "BOGUS"], batch_size=5, poll_interval=0.1)
@@ -0,0 +1,42 @@
+import pickle
+
+from game import golden
+from game.scoring import score_hand, name_hand
+from game.tables import build_table
+
+table = golden.load_golden("golden-scores.pkl")
+
+with open("rolls-scores.pkl", "rb") as file:
+    rolls = pickle.load(file)
+
+
+def test_golden_matches_labelled_rolls():
+    for roll in rolls:
+        entry = table[golden.count_vector(roll)]
+        assert entry.score == rolls[roll][0]
+        assert entry.breakdown == golden.normalise_breakdown(rolls[roll][1])
+
+
+def test_golden_covers_all_rolls():
+    assert len(table) == sum(len(build_table(no_dice)) for no_dice in range(1, 7))
+
+
+def test_score_hand():
+    assert golden.verify_scores(lambda dice: sum(score.value for score in score_hand(dice)), table,
+                                exhaustive=True) == []
+    assert golden.verify_breakdowns(score_hand, table) == []
+    assert golden.verify_names(name_hand, table) == []
+
+
+def test_table_lookup():
+    tables = {no_dice: build_table(no_dice) for no_dice in range(1, 7)}
+
+    def lookup(count_vectors):
+        return [tables[sum(counts)].scores[tables[sum(counts)].index(counts)] for counts in count_vectors]
+
+    assert golden.verify_batch(lookup, table) == []
+
+
+def test_verifier_catches_mismatches():
+    mismatches = golden.verify_batch(lambda count_vectors: [0] * len(count_vectors), table)
+    assert len(mismatches) == sum(entry.score > 0 for entry in table.values())
@@ -0,0 +1,43 @@
+from game.results import ResultRow, ResultsWriter, ResultsReader
+
+
+def sample_rows(no_games):
+    for game_id in range(no_games):
+        for seat, strategy in enumerate(["LAZY-BANK", "RANDOM"]):
+            yield ResultRow(game_id, 1000 + game_id, seat, strategy, 100 * game_id + seat, 10, seat, seat == 0)
+
+
+def test_round_trip(tmp_path):
+    rows = list(sample_rows(50))
+    with ResultsWriter(tmp_path, chunk_size=16) as writer:
+        writer.extend(rows)
+
+    with ResultsReader(tmp_path) as reader:
+        assert len(reader) == len(rows)
+        assert [reader.row(i) for i in range(len(reader))] == rows
+        assert reader.total("score") == sum(row.score for row in rows)
+        assert reader.strategies == ["LAZY-BANK", "RANDOM"]
+
+
+def test_append_and_partial_chunk(tmp_path):
+    rows = list(sample_rows(10))
+    with ResultsWriter(tmp_path, chunk_size=8) as writer:
+        writer.extend(rows[:8])
+        writer.append(rows[8])  # left in the buffer, so not yet visible to readers
+        with ResultsReader(tmp_path) as reader:
+            assert len(reader) == 8
+            assert list(reader.column("game_id")) == [row.game_id for row in rows[:8]]
+
+    with ResultsWriter(tmp_path) as writer:
+        writer.extend(rows[9:])
+
+    with ResultsReader(tmp_path) as reader:
+        assert len(reader) == len(rows)
+        assert list(reader.column("farkles")) == [row.farkles for row in rows]
+
+
+def test_empty_store(tmp_path):
+    ResultsWriter(tmp_path).close()
+    with ResultsReader(tmp_path) as reader:
+        assert len(reader) == 0
+        assert reader.mean("score") == 0.0
@@ -0,0 +1,42 @@
+import pytest
+
+from game.dice import ReplayDice
+from game.simulate import simulate, simulate_game, game_seed, play_turn
+from game.cli import main
+
+
+def test_games_replay_from_seed():
+    first = simulate_game(0, 1234, ["LAZY-BANK", "RANDOM", "LAZY-BANK"])
+    second = simulate_game(0, 1234, ["LAZY-BANK", "RANDOM", "LAZY-BANK"])
+    assert first == second
+    assert sum(row.won for row in first) == 1
+    assert max(row.score for row in first) >= 10000
+
+
+def test_batches_match_single_run():
+    single = list(simulate(20, ["LAZY-BANK", "RANDOM"], master_seed=7))
+    batched = list(simulate(12, ["LAZY-BANK", "RANDOM"], master_seed=7)) + \
+        list(simulate(8, ["LAZY-BANK", "RANDOM"], master_seed=7, first_game=12))
+    assert single == batched
+    assert single[0].seed == game_seed(7, 0)
+
+
+def test_cli_advise(capsys, tmp_path):
+    main(["advise", "--cache-dir", str(tmp_path), "1", "2", "3", "4", "6", "6"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "A MOOSE: 100"
+    assert lines[1].startswith("bank  100 [[1]], roll 5")
+
+
+def test_banking_nothing_is_not_a_farkle():
+    # the random bot sets aside neither scoring die (even flips), then stops (even flip)
+    dice = ReplayDice([1, 5, 2, 3, 4, 4, 2, 2, 2])
+    assert play_turn("RANDOM", ReplayDice(dice.dice)) == (0, False)
+
+    row, = simulate_game(0, 0, ["RANDOM"], max_rounds=1, dice=dice)
+    assert (row.score, row.turns, row.farkles) == (0, 1, 0)
+
+
+def test_cli_rejects_no_games():
+    with pytest.raises(SystemExit):
+        main(["simulate", "-n", "0"])
@@ -0,0 +1,53 @@
+from itertools import product
+import pickle
+import shutil
+
+import pytest
+
+from game import tables
+from game.scoring import score_hand, name_hand
+
+
+def test_weights_cover_all_rolls():
+    for no_dice in range(1, 7):
+        table = tables.build_table(no_dice)
+        assert sum(table.weights) == 6 ** no_dice
+        assert abs(sum(table.probability(i) for i in range(len(table))) - 1) < 1e-12
+
+
+def test_outcomes_match_scoring():
+    table = tables.build_table(4)
+    for roll in product(range(1, 7), repeat=4):
+        outcome = table.outcome(table.index(tuple(roll.count(i) for i in range(1, 7))))
+        assert outcome.score == sum(score.value for score in score_hand(list(roll)))
+        assert outcome.name == name_hand(sorted(roll))
+
+
+def test_six_dice_farkle_probability():
+    assert tables.build_table(6).farkle_probability() == 1080 / 46656
+
+
+def test_cache_round_trip(tmp_path):
+    built = tables.load_tables(tmp_path / "built", rebuild=True)
+    assert tables.cache_path(tmp_path / "built").exists()
+    assert tables.load_tables(tmp_path / "built") is built
+
+    # a different cache directory isn't served from memory, so this reads the copied cache file
+    (tmp_path / "copied").mkdir()
+    shutil.copy(tables.cache_path(tmp_path / "built"), tables.cache_path(tmp_path / "copied"))
+    loaded = tables.load_tables(tmp_path / "copied")
+    assert loaded is not built
+    assert loaded == built
+
+    with pytest.raises(TypeError):
+        loaded[1] = None
+
+
+def test_bad_cache_is_rebuilt(tmp_path):
+    for i, bad_cache in enumerate(([1, 2], {1: None})):
+        cache_dir = tmp_path / str(i)
+        cache_dir.mkdir()
+        with open(tables.cache_path(cache_dir), "wb") as file:
+            pickle.dump(bad_cache, file)
+
+        assert sorted(tables.load_tables(cache_dir)) == list(range(1, 7))